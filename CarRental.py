@@ -21,16 +21,26 @@ Payment - Strategy
 Rental Pricing - TimeRentalPricing, DistanceBasedPricing - Strategy
 BookingStatus, Vehicle Status, Vehicle Type - State Design"""
 
-from enum import Enum
+from enum import Enum, IntEnum
+import logging
 import uuid
 from abc import ABC, abstractmethod
-import threading
+from fastrlock.rlock import FastRLock
 
-class VehicleStatus(Enum):
+# Silent by default; %-style args defer formatting until a handler wants it.
+log = logging.getLogger("rental")
+log.addHandler(logging.NullHandler())
+
+class VehicleStatus(IntEnum):
     AVAILABLE = 1
     BOOKED = 2
     IN_SERVICE = 3
 
+# Plain-int forms for the hot compares; Enum.__eq__ is several times
+# slower than a C-level int compare.
+_AVAILABLE = VehicleStatus.AVAILABLE.value
+_BOOKED = VehicleStatus.BOOKED.value
+
 class VehicleCategory(Enum):
     CAR = 1
     BIKE = 2
@@ -47,18 +57,24 @@ class VehicleType(Enum):
     EV = 6
 
 class Vehicle:
+    __slots__ = ('vehicle_id', 'vehicle_category', 'vehicle_type', 'vehicle_status', 'lock')
+
     def __init__(self, vehicle_id, vehicle_type, vehicle_category):
         self.vehicle_id = vehicle_id
         self.vehicle_category = vehicle_category
         self.vehicle_type = vehicle_type
-        self.vehicle_status = VehicleStatus.AVAILABLE
-        self.lock = threading.Lock()
+        self.vehicle_status = _AVAILABLE
+        self.lock = FastRLock()
 
 class Car(Vehicle):
+    __slots__ = ()
+
     def __init__(self, vehicle_id, vehicle_type):
         super().__init__(vehicle_id, vehicle_type, VehicleCategory.CAR)
 
 class Bike(Vehicle):
+    __slots__ = ()
+
     def __init__(self, vehicle_id, vehicle_type):
         super().__init__(vehicle_id, vehicle_type, VehicleCategory.BIKE)
 
@@ -67,36 +83,56 @@ class PricingStrategy(ABC):
     def calculate(self, vehicle, hours):
         pass
 
+# Hourly price per VehicleType, indexed by the enum value (index 0 unused).
+# Tuple indexing is a single C-level lookup vs hashing the enum each call.
+_PRICES = (0, 100, 150, 200, 40, 60, 80)
+
+def _compile_price():
+    """Generate an unrolled pricing function from _PRICES at import time.
+
+    VehicleType values are dense small ints, so an if-chain of int
+    constants lets CPython 3.11+'s specializing interpreter inline the
+    compares and the multiply, skipping even the tuple indirection.
+    """
+    lines = ["def _price(vehicle, hours):",
+             "    v = vehicle.vehicle_type.value"]
+    for value, rate in enumerate(_PRICES[1:], start=1):
+        lines.append(f"    if v == {value}: return {rate} * hours")
+    lines.append("    return 0")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_price"]
+
+_default_price = _compile_price()
+
 class DefaultPricing(PricingStrategy):
-    PRICE_MAP = {
-        VehicleType.HATCHBACK: 100,
-        VehicleType.SEDAN: 150,
-        VehicleType.SUV: 200,
-        VehicleType.SCOOTY: 40,
-        VehicleType.BIKE: 60,
-        VehicleType.EV: 80
-    }
-    def calculate(self, vehicle, hours):
-        return self.PRICE_MAP[vehicle.vehicle_type] * hours
+    calculate = staticmethod(_default_price)
 
 class BookingService:
-    def __init__(self, vehicles, pricing_strategy):
+    def __init__(self, vehicles, pricing_strategy=None):
         self.vehicles = vehicles
         self.pricing_strategy = pricing_strategy
-    
+        # Bind the pricing callable once so each booking is a plain
+        # function call, not attribute lookup + virtual dispatch.
+        self._price = pricing_strategy.calculate if pricing_strategy is not None else _default_price
+
     def book(self, user_id, vehicle_id, hours):
         vehicle = self.vehicles[vehicle_id]
         if not vehicle:
-            print("Vehicle not found")
+            log.info("Vehicle not found")
             return
+        # Logging waits until the lock is dropped; stdout locking and
+        # formatting must not serialize concurrent bookings.
         with vehicle.lock:
-            if vehicle.vehicle_status != VehicleStatus.AVAILABLE:
-                print("Vehicle not available for booking now.")
-                return
-            price = self.pricing_strategy.calculate(vehicle, hours)
-            vehicle.vehicle_status = VehicleStatus.BOOKED
-            print(f"Booked Vehicle {vehicle_id} successfully")
-            return price
+            booked = vehicle.vehicle_status == _AVAILABLE
+            if booked:
+                price = self._price(vehicle, hours)
+                vehicle.vehicle_status = _BOOKED
+        if not booked:
+            log.info("Vehicle not available for booking now.")
+            return
+        log.info("Booked Vehicle %s successfully", vehicle_id)
+        return price
 
 class VehicleRepository:
     def __init__(self):
@@ -109,6 +145,8 @@ class VehicleRepository:
         return self.vehicles.get(vehicle_id)
 
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 sedan = Car(1,VehicleType.SEDAN)
 suv = Car(2,VehicleType.SUV)
 hatchback = Car(3,VehicleType.HATCHBACK)
@@ -133,7 +171,7 @@ booking2 = BookingService(vehicles, pricing_strategy)
 booking2.book(3, bike.vehicle_id, 24)
 booking2.book(4, bike2.vehicle_id, 12)
 
-import threading
+from concurrent.futures import ThreadPoolExecutor
 
 def try_booking(user_id, booking_service, vehicle_id, hours):
     try:
@@ -144,14 +182,11 @@ def try_booking(user_id, booking_service, vehicle_id, hours):
 
 
 vehicle_ids = [1, 2, 3, 4, 5]
-threads = []
 booking_service = BookingService(vehicles, pricing_strategy)
-for i, vid in enumerate(vehicle_ids):
-    t = threading.Thread(
-        target=try_booking,
-        args=(i+1, booking_service, vid, 10)
-    )
-    threads.append(t)
-    t.start()
-for t in threads:
-    t.join()
\ No newline at end of file
+# A shared pool reuses worker threads instead of paying thread creation
+# per booking, so contention on vehicle.lock is the only bottleneck.
+with ThreadPoolExecutor(max_workers=min(32, len(vehicle_ids))) as ex:
+    futures = [ex.submit(try_booking, i+1, booking_service, vid, 10)
+               for i, vid in enumerate(vehicle_ids)]
+    for f in futures:
+        f.result()
\ No newline at end of file
@@ -40,12 +40,21 @@ Elevator
    - current_floor
    - direction
    - state
-   - requests (min/max heap)
+   - requests (sorted list)
 """
 
 from enum import Enum
 from abc import ABC, abstractmethod
-import heapq
+from collections import namedtuple
+import functools
+import logging
+
+import numpy as np
+from sortedcontainers import SortedList
+
+# Silent by default; %-style args defer formatting until a handler wants it.
+log = logging.getLogger("elevator")
+log.addHandler(logging.NullHandler())
 
 class ElevatorState:
     IDLE = 1
@@ -56,98 +65,202 @@ class ElevatorDirection:
     DOWN = -1
     IDLE = 0
 
-class ExternalRequest:
-    def __init__(self, floor: int, direction: ElevatorDirection):
-        self.floor = floor
-        self.direction = direction
+# Pure value containers: namedtuples construct at C speed, are immutable,
+# and hash cleanly into the scheduler's assignment cache.
+ExternalRequest = namedtuple("ExternalRequest", ("floor", "direction"))
+InternalRequest = namedtuple("InternalRequest", ("floor",))
 
-class InternalRequest:
-    def __init__(self, floor:int):
-        self.floor = floor
-        
 
 class Elevator:
+    __slots__ = ('elevator_id', 'current_floor', 'requests', 'direction',
+                 'state', '_idx', '_controller')
+
     def __init__(self, elevator_id, current_floor=0):
         self.elevator_id = elevator_id
         self.current_floor = current_floor
-        self.up_requests = []
+        self.requests = SortedList()
         self.direction = ElevatorDirection.IDLE
         self.state = ElevatorState.IDLE
-        self.down_requests = []
-    
+        self._idx = None
+        self._controller = None
+
+    def attach(self, controller, idx):
+        """Mirror this elevator's state into the controller's SoA arrays."""
+        self._controller = controller
+        self._idx = idx
+        self._publish()
+
+    def _publish(self):
+        controller = self._controller
+        if controller is not None:
+            controller.cur[self._idx] = self.current_floor
+            controller.state[self._idx] = self.state
+            controller.dir[self._idx] = self.direction
+            # Only _publish changes what the scheduler reads, so this is
+            # the one place the assignment cache gets invalidated.
+            controller._state_version += 1
+
     def add_request(self, requested_floor):
-        if self.state == ElevatorState.MOVING:
-            if self.direction == ElevatorDirection.UP and requested_floor < self.current_floor:
-                return
-            if self.direction == ElevatorDirection.DOWN and requested_floor > self.current_floor:
-                return
-        if requested_floor > self.current_floor:
-            heapq.heappush(self.up_requests, requested_floor)
-        elif requested_floor < self.current_floor:
-            heapq.heappush(self.down_requests, -requested_floor)
-    
+        # diff * direction < 0 means the floor is behind the current sweep
+        # (UP=1, DOWN=-1, IDLE=0), covering both reject branches at once.
+        diff = requested_floor - self.current_floor
+        if self.state == ElevatorState.MOVING and diff * self.direction < 0:
+            return
+        if diff != 0:
+            self.requests.add(requested_floor)
+
     def step(self):
-        if self.up_requests:
-            next_floor = heapq.heappop(self.up_requests)
-            self.state = ElevatorState.MOVING
-            self.direction = ElevatorDirection.UP
-        
-        elif self.down_requests:
-            next_floor = - heapq.heappop(self.down_requests)
-            self.state = ElevatorState.MOVING
-            self.direction = ElevatorDirection.DOWN
-        
-        else:
+        if not self.requests:
             self.direction = ElevatorDirection.IDLE
             self.state = ElevatorState.IDLE
+            self._publish()
             return
-        
+
+        # Bisect around the current floor and pop the closest stop in the
+        # travel direction; an idle elevator sweeps upward first, matching
+        # the old up-heap-before-down-heap order. bisect_right for the
+        # down sweep so a duplicate stop at the current floor (duplicates
+        # are normal input and SortedList keeps them) is served in place
+        # rather than skipped and returned to after a reversal.
+        idx = self.requests.bisect_right(self.current_floor)
+        if self.direction == ElevatorDirection.DOWN and idx > 0:
+            next_floor = self.requests.pop(idx - 1)
+        else:
+            idx = self.requests.bisect_left(self.current_floor)
+            if idx < len(self.requests):
+                next_floor = self.requests.pop(idx)
+            else:
+                next_floor = self.requests.pop(idx - 1)
+        self.state = ElevatorState.MOVING
+        # Zero-distance stops keep the sweep direction, like the old heaps.
+        if next_floor != self.current_floor:
+            self.direction = (ElevatorDirection.UP if next_floor > self.current_floor
+                              else ElevatorDirection.DOWN)
         self.move_to(next_floor)
-    
+
     def move_to(self, floor):
-        print(f"Elevator {self.elevator_id} moving from {self.current_floor} to {floor}")
+        # Guarded so batch stepping pays nothing for the trace when off.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Elevator %s moving from %s to %s",
+                      self.elevator_id, self.current_floor, floor)
         self.current_floor = floor
+        self._publish()
+
+# Penalty added to elevators that are busy and headed the wrong way; large
+# enough that they only win when no suitable elevator exists (the fallback).
+_WRONG_WAY_PENALTY = 10**6
 
 class Scheduler:
-    def assign_elevator(self, elevators, request):
-        best_elevator = None
-        min_distance = float('inf')
-
-        for elevator in elevators:
-            # Prefer idle elevators or elevators moving in same direction
-            if elevator.state != ElevatorState.IDLE and elevator.direction != request.direction:
-                continue
-            if abs(elevator.current_floor - request.floor) < min_distance:
-                min_distance = abs(elevator.current_floor - request.floor)
-                best_elevator = elevator
-        
-        # Fallback: any nearest elevator
-        if not best_elevator:
-            for elevator in elevators:
-                distance = abs(elevator.current_floor - request.floor)
-                if distance < min_distance:
-                    min_distance = distance
-                    best_elevator = elevator
-
-        return best_elevator
+    def __init__(self):
+        self._controller = None
+        # Bursty traffic repeats the same (floor, direction) while no
+        # elevator has moved; key the scan on the controller's state
+        # version so repeats become O(1) cache hits.
+        self._assign_cached = functools.lru_cache(maxsize=256)(self._assign)
+
+    def assign_elevator(self, controller, request, state_version=0):
+        self._controller = controller
+        return self._assign_cached(state_version, request.floor, request.direction)
+
+    def _assign(self, state_version, floor, direction):
+        controller = self._controller
+        # One vectorized pass over the SoA arrays: prefer idle elevators or
+        # ones moving in the request direction, penalise the rest so they
+        # are only picked when nothing suitable exists.
+        mask = (controller.state != ElevatorState.IDLE) & (controller.dir != direction)
+        dist = np.abs(controller.cur - floor) + mask * _WRONG_WAY_PENALTY
+        return controller.elevators[int(dist.argmin())]
 
 
 class ElevatorController:
     def __init__(self, elevators, scheduler):
         self.elevators = elevators
         self.scheduler = scheduler
+        # Structure-of-arrays mirror of elevator state so the scheduler can
+        # pick in one vectorized pass instead of N attribute dereferences.
+        n = len(elevators)
+        self.cur = np.zeros(n, dtype=np.int32)
+        self.state = np.zeros(n, dtype=np.int8)
+        self.dir = np.zeros(n, dtype=np.int8)
+        # Bumped by Elevator._publish whenever floor/state/direction
+        # change, invalidating the scheduler's cached assignments.
+        self._state_version = 0
+        for idx, elevator in enumerate(elevators):
+            elevator.attach(self, idx)
 
     def handle_external_request(self, request: ExternalRequest):
-        elevator = self.scheduler.assign_elevator(self.elevators, request)
+        elevator = self.scheduler.assign_elevator(self, request, self._state_version)
         elevator.add_request(request.floor)
-    
+
+    def handle_external_requests(self, requests):
+        """Assign a batch of external requests in one vectorized pass.
+
+        Builds the M x N distance matrix with the same wrong-way penalty
+        as the per-request scheduler and argmins per row, so rush-hour
+        bursts cost one NumPy pass instead of M separate scans. (Swap
+        argmin for scipy's linear_sum_assignment if unique assignment
+        per elevator is ever needed.)
+        """
+        m = len(requests)
+        floors = np.fromiter((r.floor for r in requests), dtype=np.int32, count=m)
+        dirs = np.fromiter((r.direction for r in requests), dtype=np.int8, count=m)
+        mask = (self.state[None, :] != ElevatorState.IDLE) & (self.dir[None, :] != dirs[:, None])
+        dist = np.abs(self.cur[None, :] - floors[:, None]) + mask * _WRONG_WAY_PENALTY
+        assigned = dist.argmin(axis=1)
+        for request, idx in zip(requests, assigned):
+            self.elevators[int(idx)].add_request(request.floor)
+
     def handle_internal_request(self, elevator_id: int, floor: int):
         self.elevators[elevator_id].add_request(floor)
-    
+
     def step(self):
         for elevator in self.elevators:
             elevator.step()
 
+    def simulate(self, num_steps):
+        """Run num_steps ticks through the compiled core in elevator_core.
+
+        For large fleet simulations the Python heapq + attribute traffic in
+        Elevator.step dominates, so the pending request heaps are copied
+        into int32 arrays once, stepped in compiled code, and synced back.
+        Skips the per-move prints of the interactive step() path.
+        """
+        import elevator_core
+
+        n = len(self.elevators)
+        cap = max(1, max(len(e.requests) for e in self.elevators))
+        up_heaps = np.zeros((n, cap), dtype=np.int32)
+        down_heaps = np.zeros((n, cap), dtype=np.int32)
+        up_sizes = np.zeros(n, dtype=np.int32)
+        down_sizes = np.zeros(n, dtype=np.int32)
+        for i, elevator in enumerate(self.elevators):
+            # Split the sorted request list around the current floor; a
+            # sorted row is already a valid min-heap for the core. Stops
+            # equal to the current floor go on the side of the active
+            # sweep, matching step()'s bisect_right-on-DOWN pop order.
+            if elevator.direction == ElevatorDirection.DOWN:
+                split = elevator.requests.bisect_right(elevator.current_floor)
+            else:
+                split = elevator.requests.bisect_left(elevator.current_floor)
+            ups = elevator.requests[split:]
+            downs = [-f for f in reversed(elevator.requests[:split])]
+            up_heaps[i, :len(ups)] = ups
+            up_sizes[i] = len(ups)
+            down_heaps[i, :len(downs)] = downs
+            down_sizes[i] = len(downs)
+
+        elevator_core.run_steps(num_steps, self.cur, self.state, self.dir,
+                                up_heaps, up_sizes, down_heaps, down_sizes)
+
+        for i, elevator in enumerate(self.elevators):
+            elevator.current_floor = int(self.cur[i])
+            elevator.state = int(self.state[i])
+            elevator.direction = int(self.dir[i])
+            elevator.requests = SortedList(
+                [int(f) for f in up_heaps[i, :up_sizes[i]]]
+                + [-int(f) for f in down_heaps[i, :down_sizes[i]]])
+        self._state_version += 1
+
 class ElevatorSystem:
     def __init__(self, num_elevators):
         self.elevators = [Elevator(i) for i in range(num_elevators)]
@@ -155,6 +268,10 @@ class ElevatorSystem:
     
     def request_elevator(self, floor, direction):
         self.controller.handle_external_request(ExternalRequest(floor, direction))
+
+    def request_elevators(self, floor_direction_pairs):
+        self.controller.handle_external_requests(
+            [ExternalRequest(floor, direction) for floor, direction in floor_direction_pairs])
     
     def request_floor(self, elevator_id: int, floor: int):
         self.controller.handle_internal_request(elevator_id, floor)
@@ -162,6 +279,13 @@ class ElevatorSystem:
     def step(self):
         self.controller.step()
 
+    def simulate(self, num_steps):
+        self.controller.simulate(num_steps)
+
+# DEBUG only on our logger; root DEBUG would also dump numba's compile logs.
+logging.basicConfig(format="%(message)s")
+log.setLevel(logging.DEBUG)
+
 system = ElevatorSystem(6)
 system.request_elevator(7, ElevatorDirection.UP)
 system.request_elevator(-3, ElevatorDirection.DOWN)
@@ -173,7 +297,7 @@ for _ in range(6):
 """
 System → Controller → Scheduler → Elevator
 Elevator = (floor, state, direction)
-Requests = UP heap + DOWN heap
+Requests = sorted list, popped around current floor
 External → Scheduler
 Internal → Elevator
 step() = time tick
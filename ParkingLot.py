@@ -1,128 +1,193 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from abc import ABC, abstractmethod
-import uuid
+from collections import deque
+from itertools import count
+import logging
 import time
-import threading
+from fastrlock.rlock import FastRLock
 
-class SlotStatus(Enum):
+# Silent by default; %-style args defer formatting until a handler wants it.
+log = logging.getLogger("parking")
+log.addHandler(logging.NullHandler())
+
+class SlotStatus(IntEnum):
     AVAILABLE = 1
     BOOKED = 2
 
+# Plain-int forms for the hot compares; Enum.__eq__ is several times
+# slower than a C-level int compare.
+_AVAILABLE = SlotStatus.AVAILABLE.value
+_BOOKED = SlotStatus.BOOKED.value
+
 class VehicleCategory(Enum):
     CAR = 1
     BIKE = 2
 
 class Vehicle:
+    __slots__ = ('vehicle_id', 'vehicle_type')
+
     def __init__(self, vehicle_id, vehicle_type):
         self.vehicle_id = vehicle_id
         self.vehicle_type = vehicle_type
 
 class Car(Vehicle):
+    __slots__ = ()
+
     def __init__(self, vehicle_id):
         super().__init__(vehicle_id, VehicleCategory.CAR)
 
 class Bike(Vehicle):
+    __slots__ = ()
+
     def __init__(self, vehicle_id):
         super().__init__(vehicle_id, VehicleCategory.BIKE)
 
 class Slot:
+    __slots__ = ('slot_id', 'vehicle_type', 'slot_status', 'vehicle', 'floor_id',
+                 'active_ticket', 'lock')
+
     def __init__(self, slot_id, vehicle_type):
         self.slot_id = slot_id
         self.vehicle_type = vehicle_type
-        self.slot_status = SlotStatus.AVAILABLE
+        self.slot_status = _AVAILABLE
         self.vehicle = None
-        self.lock = threading.Lock()
+        self.floor_id = None
+        self.active_ticket = None
+        self.lock = FastRLock()
     
     def park(self, vehicle):
         self.vehicle = vehicle
-        self.slot_status = SlotStatus.BOOKED
+        self.slot_status = _BOOKED
     
     def unpark(self):
         self.vehicle = None
-        self.slot_status = SlotStatus.AVAILABLE
+        self.slot_status = _AVAILABLE
 
 class ParkingFloor:
     def __init__(self, floor_id, slots):
         self.floor_id = floor_id
         self.slots = slots
+        # Static all-slots-by-type index; get_free_slot re-checks status,
+        # the maintained free-list lives on ParkingLot.
+        self.slots_by_type = {}
+        for slot in slots:
+            slot.floor_id = floor_id
+            self.slots_by_type.setdefault(slot.vehicle_type, deque()).append(slot)
 
     def get_free_slot(self, vehicle_type):
-        for slot in self.slots:
-            if slot.slot_status == SlotStatus.AVAILABLE and slot.vehicle_type == vehicle_type:
+        for slot in self.slots_by_type.get(vehicle_type, ()):
+            if slot.slot_status == _AVAILABLE:
                 return slot
         return None
 
+class ParkingLot:
+    def __init__(self, floors):
+        self.floors = floors
+        # Global free-list per vehicle type so allocation is O(1) instead of
+        # an O(floors x slots) scan. deque.popleft/append are atomic in CPython.
+        self.global_free = {}
+        for floor in floors:
+            for slot in floor.slots:
+                self.global_free.setdefault(slot.vehicle_type, deque()).append(slot)
+
+    def release_slot(self, slot):
+        self.global_free[slot.vehicle_type].append(slot)
+
 class SlotAllocationStrategy(ABC):
     @abstractmethod
-    def allocate_slot(self, floors, vehicle_type):
+    def allocate_slot(self, vehicle_type):
         pass
 
 class NearestSlotAllocationStrategy(SlotAllocationStrategy):
-    def allocate_slot(self, floors, vehicle_type):
-        for floor in floors:
-            for slot in floor.slots:
-                if slot.vehicle_type != vehicle_type:
-                    continue
-                acquired = slot.lock.acquire(blocking=False)
-                if not acquired:
-                    continue
-                if slot.slot_status == SlotStatus.AVAILABLE :
-                    print(f"Got free slot {slot.slot_id} on floor {floor.floor_id}")
-                    return slot
-                slot.lock.release()
+    def __init__(self, parking_lot):
+        # Bind the per-type free-lists once; allocation then touches only
+        # slots of the requested type, with no per-call lot traversal.
+        self._free_by_type = parking_lot.global_free
+
+    def allocate_slot(self, vehicle_type):
+        dq = self._free_by_type.get(vehicle_type)
+        while dq:
+            try:
+                slot = dq.popleft()
+            except IndexError:
+                break
+            acquired = slot.lock.acquire(blocking=False)
+            if not acquired:
+                # Slots are only re-appended after their lock is released,
+                # so a failed try-acquire means a stale duplicate entry.
+                continue
+            if slot.slot_status == _AVAILABLE :
+                return slot
+            slot.lock.release()
         return None
 
+# uuid4 reads os.urandom per ticket -- a syscall we don't need since ticket
+# ids only have to be unique within the process, not unguessable.
+_ticket_counter = count(1)
+
 class Ticket:
+    __slots__ = ('ticket_id', 'slot', 'vehicle', 'entry_time_ns')
+
     def __init__(self, slot, vehicle):
-        self.ticket_id = str(uuid.uuid4())
+        self.ticket_id = next(_ticket_counter)
         self.slot = slot
         self.vehicle = vehicle
-        self.entry_time = time.time()
+        # monotonic_ns is cheaper than time.time on most systems and is
+        # immune to wallclock jumps; durations stay in integer arithmetic.
+        self.entry_time_ns = time.monotonic_ns()
+
+_NS_PER_HOUR = 3_600_000_000_000
 
 class PricingService:
-    def calculate_price(self, entry_time, exit_time):
-        hours = max(1, (exit_time - entry_time)/3600)
+    def calculate_price(self, entry_ns, exit_ns):
+        hours = max(1, (exit_ns - entry_ns) // _NS_PER_HOUR)
         return hours * 50
 
 class ParkingService:
-    def __init__(self, floors, slot_allocation_strategy, pricing_service):
-        self.floors = floors
+    def __init__(self, parking_lot, slot_allocation_strategy, pricing_service):
+        self.parking_lot = parking_lot
         self.allocation_strategy = slot_allocation_strategy
         self.pricing_service = pricing_service
-        self.active_tickets = {}
-    
+
     def park_vehicle(self, vehicle):
-        # slot lock is already held here
-        slot = self.allocation_strategy.allocate_slot(self.floors, vehicle.vehicle_type)
+        # The allocator returns the slot with its lock held and AVAILABLE
+        # already verified, so no re-check is needed here.
+        slot = self.allocation_strategy.allocate_slot(vehicle.vehicle_type)
         if not slot:
-            print("No available slot")
+            log.info("No available slot")
             return
-        # with slot.lock:
         try:
-            if slot.slot_status != SlotStatus.AVAILABLE:
-                return None
             slot.park(vehicle)
             ticket = Ticket(slot, vehicle)
-            self.active_tickets[ticket.ticket_id] = ticket
-            print(f"{vehicle.vehicle_type} with vehicle Number {vehicle.vehicle_id} parked successfully on slot {slot.slot_id}")
-            return ticket
+            slot.active_ticket = ticket
         finally:
             slot.lock.release()
+        # Logging happens after the lock is released; stdout locking and
+        # formatting must not serialize concurrent parkers.
+        log.info("Got free slot %s on floor %s", slot.slot_id, slot.floor_id)
+        log.info("%s with vehicle Number %s parked successfully on slot %s",
+                 vehicle.vehicle_type, vehicle.vehicle_id, slot.slot_id)
+        return ticket
 
     def unpark_vehicle(self, ticket):
-        if ticket.ticket_id not in self.active_tickets:
+        # Pointer compare against the slot's live ticket, no dict hashing.
+        if ticket.slot.active_ticket is not ticket:
             raise Exception("Invalid or expired ticket")
         slot = ticket.slot
         # with slot.lock:
         slot.lock.acquire()
         try:
-            parking_fee = self.pricing_service.calculate_price(ticket.entry_time, time.time())
+            parking_fee = self.pricing_service.calculate_price(ticket.entry_time_ns, time.monotonic_ns())
             ticket.slot.unpark()
-            print(f"Parking fee for {ticket.vehicle.vehicle_id} at {ticket.entry_time} is {parking_fee}")
-            ticket = self.active_tickets.pop(ticket.ticket_id)
-            return parking_fee
+            slot.active_ticket = None
         finally:
             slot.lock.release()
+        # Re-append only after dropping the lock: a slot sitting in the
+        # deque with its lock still held would fail allocate_slot's
+        # try-acquire and leak off the free-list for good.
+        self.parking_lot.release_slot(slot)
+        log.info("Parking fee for %s is %s", ticket.vehicle.vehicle_id, parking_fee)
+        return parking_fee
 
 """
 I use slot-level locking because a parking slot is the smallest shared mutable resource.
@@ -135,6 +200,7 @@ Unparking follows the same locking discipline to ensure consistency.
 """
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     car1 = Car("KA-123-456-89")
     car2 = Car("UP-92-123-456")
     car3 = Car("UP-92-123-457")
@@ -154,9 +220,10 @@ def main():
     floors = []
     floors.append(floor1)
     floors.append(floor2)
-    slot_allocation_strategy = NearestSlotAllocationStrategy()
+    parking_lot = ParkingLot(floors)
+    slot_allocation_strategy = NearestSlotAllocationStrategy(parking_lot)
     pricing_service = PricingService()
-    ps = ParkingService(floors, slot_allocation_strategy, pricing_service)
+    ps = ParkingService(parking_lot, slot_allocation_strategy, pricing_service)
 
     ticket1 = ps.park_vehicle(car1)
     ticket2 = ps.park_vehicle(car2)
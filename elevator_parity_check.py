@@ -0,0 +1,67 @@
+"""Differential check: n calls to step() must match one simulate(n).
+
+Builds identical randomized request workloads (external + internal, with
+deliberate duplicate floors) on two fresh systems, drains one through the
+interactive step() path and the other through the compiled batch core,
+and compares the full end state of every elevator. Exits non-zero on any
+mismatch, so the step/simulate equivalence is enforced, not asserted.
+
+Run directly: python elevator_parity_check.py
+"""
+
+import logging
+import random
+
+import ElevatorSystem as es
+
+NUM_SEEDS = 50
+NUM_ELEVATORS = 4
+NUM_REQUESTS = 12
+TICKS = 20
+FLOORS = range(-3, 10)
+
+
+def build_system(seed):
+    rng = random.Random(seed)
+    system = es.ElevatorSystem(NUM_ELEVATORS)
+    floors = []
+    for _ in range(NUM_REQUESTS):
+        floor = rng.choice(FLOORS)
+        floors.append(floor)
+        # Duplicate floors are normal input (several riders, one floor).
+        if floors and rng.random() < 0.3:
+            floors.append(rng.choice(floors))
+    for floor in floors:
+        if rng.random() < 0.5:
+            direction = rng.choice((es.ElevatorDirection.UP, es.ElevatorDirection.DOWN))
+            system.request_elevator(floor, direction)
+        else:
+            system.request_floor(rng.randrange(NUM_ELEVATORS), floor)
+    return system
+
+
+def end_state(system):
+    return [(e.current_floor, e.state, e.direction, list(e.requests))
+            for e in system.elevators]
+
+
+def main():
+    es.log.setLevel(logging.WARNING)
+    mismatches = 0
+    for seed in range(NUM_SEEDS):
+        stepped = build_system(seed)
+        for _ in range(TICKS):
+            stepped.step()
+        simulated = build_system(seed)
+        simulated.simulate(TICKS)
+        if end_state(stepped) != end_state(simulated):
+            mismatches += 1
+            print(f"seed {seed}: MISMATCH")
+            print(f"  step():     {end_state(stepped)}")
+            print(f"  simulate(): {end_state(simulated)}")
+    print(f"{NUM_SEEDS - mismatches}/{NUM_SEEDS} workloads matched")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())